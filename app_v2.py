@@ -1,37 +1,103 @@
 import streamlit as st
+import pypdfium2 as pdfium
 from pdfminer.high_level import extract_text as pdfminer_extract_text
 import pandas as pd
 import re
-import io
-from typing import Dict, List
-import numpy as np  # (you can remove later if unused)
+import string
+import hashlib
+import threading
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
 
 # Configure page
 st.set_page_config(page_title="Shop Drawing Review Tool", layout="wide")
 st.title("📐 Shop Drawing Review Tool")
 st.write("Upload structural and shop drawings to compare member sizes and identify discrepancies.")
 
+# Numbers (integer or decimal) within a member designation, e.g. 310 and 46.2
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# Line breaks in extracted text, used to map match offsets back to lines
+_NEWLINE_RE = re.compile('\n')
+
+# Uppercases ASCII letters only, so the string keeps its length and offsets
+_ASCII_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+
+# Dimension separators (X after uppercasing, ×) normalized to a lowercase x
+_DIMENSION_SEPARATORS = str.maketrans({'X': 'x', '×': 'x'})
+
+def _dedup(members: Iterable[Dict]) -> List[Dict]:
+    """Remove duplicate members by normalized designation, keeping the first seen"""
+    unique_members = {}
+    for member in members:
+        unique_members.setdefault(member['normalized'], member)
+    return list(unique_members.values())
+
+# PDFium is not thread-safe, so calls into it are serialized across concurrent sessions
+_PDFIUM_LOCK = threading.Lock()
+
+def _pdfium_extract_text(pdf_file, page_range=None) -> str:
+    """Extract text with PDFium, limited to page_range (start, end) if given"""
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_file)
+        try:
+            start, end = page_range or (0, len(pdf))
+            page_texts = []
+            for page_index in range(start, min(end, len(pdf))):
+                page = pdf[page_index]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        page_texts.append(textpage.get_text_bounded())
+                    finally:
+                        textpage.close()
+                finally:
+                    page.close()
+            return "\n".join(page_texts)
+        finally:
+            pdf.close()
+
+def _hash_pdf_file(pdf_file) -> str:
+    """SHA-1 of an uploaded PDF, read in 64 KB chunks instead of one full copy"""
+    pdf_file.seek(0)
+    digest = hashlib.sha1()
+    for chunk in iter(lambda: pdf_file.read(65536), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _extract_pdf_text(_pdf_file, file_hash: str, page_range=None) -> Tuple[str, str]:
+    """Extract text and the method used, cached on the file hash across reruns"""
+    try:
+        _pdf_file.seek(0)
+        text = _pdfium_extract_text(_pdf_file, page_range)
+        return text, "Direct PDF text extraction (pypdfium2)"
+    except pdfium.PdfiumError:
+        # Fall back to pdfminer.six for PDFs that PDFium cannot open
+        _pdf_file.seek(0)
+        if page_range:
+            # maxpages counts from the first page, so stop once page_range's end is reached
+            start, end = page_range
+            text = pdfminer_extract_text(_pdf_file, page_numbers=set(range(start, end)), maxpages=end)
+        else:
+            text = pdfminer_extract_text(_pdf_file)
+        return text or "", "Direct PDF text extraction (pdfminer.six)"
+
 class PDFProcessor:
     """Handles PDF text extraction (no OCR, Cloud-friendly)"""
 
     def __init__(self):
         self.text_content = ""
-        self.extraction_method = ""
 
-    def extract_text_from_pdf(self, pdf_file, page_range=None) -> str:
-        """Extract text from PDF using pdfminer.six (no OCR)."""
+    def extract_text_from_pdf(self, pdf_file, page_range=None) -> Dict:
+        """Extract text from PDF using pypdfium2, falling back to pdfminer.six (no OCR)."""
+        # Return the method and error rather than storing them: the processor is shared across sessions
         try:
-            pdf_file.seek(0)
-            pdf_bytes = pdf_file.read()
-
-            # pdfminer works with file-like objects too
-            text = pdfminer_extract_text(io.BytesIO(pdf_bytes))
-
-            self.extraction_method = "Direct PDF text extraction (pdfminer.six)"
-            return text or ""
+            text, method = _extract_pdf_text(pdf_file, _hash_pdf_file(pdf_file), page_range)
+            return {'text': text, 'method': method, 'error': ''}
         except Exception as e:
-            st.error(f"Error processing PDF: {str(e)}")
-            return ""
+            return {'text': '', 'method': '', 'error': str(e)}
 
     def _has_meaningful_content(self, text: str) -> bool:
         """Check if extracted text contains meaningful Australian structural drawing content"""
@@ -49,61 +115,123 @@ class MemberParser:
     
     def __init__(self):
         # Australian steel member patterns (AS/NZS 3679) - UPDATED WITH v55 PATTERNS
+        # Leading lookbehinds reject matches that start mid-token (the M24 in ITEM24,
+        # the 10UB46 in 310UB46) but keep prefixed callouts such as 4M20, 2x310UB46.2
+        # and 2xSHS100x6 (X is allowed before a letter since text is uppercased).
+        # Possessive quantifiers (Python 3.11+) stop the engine backtracking through
+        # long runs of dimensions and numbers
         self.patterns = {
-            'ub': r'(\d+)UB(\d+(?:\.\d+)?)',  # 310UB46.2, 460UB82
-            'uc': r'(\d+)UC(\d+(?:\.\d+)?)',  # 200UC59.5, 310UC158
-            'wb': r'(\d+)WB(\d+(?:\.\d+)?)',  # 200WB52, 250WB37
-            'shs': r'SHS(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)',  # SHS100x6, SHS150×10
-            'rhs': r'RHS(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)',  # RHS100x50x6
-            'chs': r'CHS(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)',  # CHS114x6.0, CHS168×8
-            'angle': r'(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)(?:UA|EA|L)',  # 75x75x6UA, 100x100x8EA
-            'angle_ea': r'(\d+(?:\.\d+)?)EA(\d+(?:\.\d+)?)',  # 75EA6, 100EA8
-            'angle_ua_alt': r'(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)UA(\d+(?:\.\d+)?)',  # 150x90UA10
-            'channel': r'(\d+)(?:PFC|UCA)(\d+(?:\.\d+)?)',  # 200PFC23, 150UCA23.4
-            'channel_simple': r'(\d+)PFC(?!\d)',  # 150PFC (without mass)
-            'tee': r'(\d+)BT(\d+(?:\.\d+)?)',  # 180BT46.5 (Tee sections)
-            'flat': r'(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)(?:FL|FLAT)',  # 200x16FL (Flat bars)
-            'plate': r'(\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)[Xx×](\d+(?:\.\d+)?)PL',  # 300x250x12PL
-            'rod': r'M(\d+)',  # M24 (Threaded rods)
+            'ub': r'(?<![\d.])(\d++)UB(\d++(?:\.\d++)?+)',  # 310UB46.2, 460UB82
+            'uc': r'(?<![\d.])(\d++)UC(\d++(?:\.\d++)?+)',  # 200UC59.5, 310UC158
+            'wb': r'(?<![\d.])(\d++)WB(\d++(?:\.\d++)?+)',  # 200WB52, 250WB37
+            'shs': r'(?<![A-WYZ])SHS(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)',  # SHS100x6, SHS150×10
+            'rhs': r'(?<![A-WYZ])RHS(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)',  # RHS100x50x6
+            'chs': r'(?<![A-WYZ])CHS(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)',  # CHS114x6.0, CHS168×8
+            'angle': r'(?<![\d.])(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)(?:UA|EA|L)',  # 75x75x6UA, 100x100x8EA
+            'angle_ea': r'(?<![\d.])(\d++(?:\.\d++)?+)EA(\d++(?:\.\d++)?+)',  # 75EA6, 100EA8
+            'angle_ua_alt': r'(?<![\d.])(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)UA(\d++(?:\.\d++)?+)',  # 150x90UA10
+            'channel': r'(?<![\d.])(\d++)(?:PFC|UCA)(\d++(?:\.\d++)?+)',  # 200PFC23, 150UCA23.4
+            'channel_simple': r'(?<![\d.])(\d++)PFC(?!\d)',  # 150PFC (without mass)
+            'tee': r'(?<![\d.])(\d++)BT(\d++(?:\.\d++)?+)',  # 180BT46.5 (Tee sections)
+            'flat': r'(?<![\d.])(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)(?:FL|FLAT)',  # 200x16FL (Flat bars)
+            'plate': r'(?<![\d.])(\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)[X×](\d++(?:\.\d++)?+)PL',  # 300x250x12PL
+            'rod': r'(?<![A-WYZ])M(\d++)',  # M24 (Threaded rods)
             # Alternative patterns for common variations
-            'ub_alt': r'UB(\d+)[Xx×](\d+(?:\.\d+)?)',  # UB310x46.2
-            'uc_alt': r'UC(\d+)[Xx×](\d+(?:\.\d+)?)',  # UC200x59.5
-            'wb_alt': r'WB(\d+)[Xx×](\d+(?:\.\d+)?)',  # WB200x52
-            'tfb': r'(\d+)TFB(\d+(?:\.\d+)?)',  # 180TFB46 (Taper Flange Beams)
-            'wc': r'(\d+)WC(\d+(?:\.\d+)?)',  # 310WC137 (Welded Columns)
+            'ub_alt': r'(?<![A-WYZ])UB(\d++)[X×](\d++(?:\.\d++)?+)',  # UB310x46.2
+            'uc_alt': r'(?<![A-WYZ])UC(\d++)[X×](\d++(?:\.\d++)?+)',  # UC200x59.5
+            'wb_alt': r'(?<![A-WYZ])WB(\d++)[X×](\d++(?:\.\d++)?+)',  # WB200x52
+            'tfb': r'(?<![\d.])(\d++)TFB(\d++(?:\.\d++)?+)',  # 180TFB46 (Taper Flange Beams)
+            'wc': r'(?<![\d.])(\d++)WC(\d++(?:\.\d++)?+)',  # 310WC137 (Welded Columns)
         }
+
+        # Literal tokens each pattern requires; a pattern whose tokens do not
+        # appear anywhere in the text cannot match and is left out of the scan
+        self.literals = {
+            'ub': ('UB',),
+            'uc': ('UC',),
+            'wb': ('WB',),
+            'shs': ('SHS',),
+            'rhs': ('RHS',),
+            'chs': ('CHS',),
+            'angle': ('UA', 'EA', 'L'),
+            'angle_ea': ('EA',),
+            'angle_ua_alt': ('UA',),
+            'channel': ('PFC', 'UCA'),
+            'channel_simple': ('PFC',),
+            'tee': ('BT',),
+            'flat': ('FL',),
+            'plate': ('PL',),
+            'rod': ('M',),
+            'ub_alt': ('UB',),
+            'uc_alt': ('UC',),
+            'wb_alt': ('WB',),
+            'tfb': ('TFB',),
+            'wc': ('WC',),
+        }
+
+        # Compile once: a single alternation of all patterns, named by member
+        # type, so the text is scanned in one pass. The alternation is
+        # leftmost-first and consumes what it matches, so a designation that
+        # overlaps an earlier match is not reported (M150PFC gives M150 only).
+        # Compiled per subset of patterns left by the literal prefilter; the
+        # full set is compiled up front
+        self._combined_cache = {}
+        self._compile_combined(tuple(self.patterns))
+    
+    def _compile_combined(self, member_types: tuple) -> re.Pattern:
+        """Compile (once) a single alternation of the given member patterns"""
+        if member_types not in self._combined_cache:
+            # Every member starts with a digit or its leading literal (SHS, UB, M...).
+            # Gating the alternation on those characters lets the engine reject
+            # all other positions with one class test instead of trying each pattern
+            first_chars = set()
+            for name in member_types:
+                # Skip the leading lookbehind to reach the first character matched
+                pattern = self.patterns[name]
+                pattern = pattern[pattern.index(')') + 1:]
+                first_chars.add(r'\d' if pattern.startswith(r'(\d') else pattern[0])
+            self._combined_cache[member_types] = re.compile(
+                f"(?=[{''.join(sorted(first_chars))}])(?:"
+                + '|'.join(f'(?P<{name}>{self.patterns[name]})' for name in member_types)
+                + ')'
+            )
+        return self._combined_cache[member_types]
     
-    def extract_members_from_text(self, text: str) -> List[Dict]:
-        """Extract all member designations from text"""
-        members = []
-        lines = text.split('\n')
+    def extract_members_from_text(self, text: str) -> Iterator[Dict]:
+        """Yield every member designation found in text, in order (may repeat)"""
+        # Line boundaries as sorted offsets, so each match finds its line by bisection
+        newline_offsets = [newline.start() for newline in _NEWLINE_RE.finditer(text)]
         
-        for line_num, line in enumerate(lines):
-            for member_type, pattern in self.patterns.items():
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    member_info = {
-                        'raw_text': match.group(0),
-                        'normalized': self._normalize_member(match.group(0), member_type),
-                        'type': member_type,
-                        'line_number': line_num + 1,
-                        'context': line.strip()
-                    }
-                    members.append(member_info)
+        # Patterns are uppercase-only, so scan an ASCII-uppercased copy (same length
+        # and offsets as text) rather than matching case-insensitively
+        text_upper = text.translate(_ASCII_UPPER)
         
-        # Remove duplicates while preserving order
-        unique_members = []
-        seen = set()
-        for member in members:
-            if member['normalized'] not in seen:
-                unique_members.append(member)
-                seen.add(member['normalized'])
+        # Prefilter on literal tokens so only patterns that can match are scanned
+        member_types = tuple(
+            name for name in self.patterns
+            if any(literal in text_upper for literal in self.literals[name])
+        )
+        if not member_types:
+            return
         
-        return unique_members
+        for match in self._compile_combined(member_types).finditer(text_upper):
+            member_type = match.lastgroup
+            raw_text = text[match.start():match.end()]
+            line_index = bisect_right(newline_offsets, match.start())
+            line_start = newline_offsets[line_index - 1] + 1 if line_index > 0 else 0
+            line_end = newline_offsets[line_index] if line_index < len(newline_offsets) else len(text)
+            member_info = {
+                'raw_text': raw_text,
+                'normalized': self._normalize_member(raw_text, member_type),
+                'type': member_type,
+                'line_number': line_index + 1,
+                'context': text[line_start:line_end].strip()
+            }
+            yield member_info
     
     def _normalize_member(self, member_str: str, member_type: str) -> str:
         """Normalize Australian member designation to standard format"""
-        member_str = member_str.upper().replace('X', 'x').replace('×', 'x')
+        member_str = member_str.upper().translate(_DIMENSION_SEPARATORS)
         
         # Normalize different Australian formats to consistent style
         if member_type in ['ub', 'uc', 'wb', 'tfb', 'wc']:
@@ -112,7 +240,7 @@ class MemberParser:
                 return member_str
             else:
                 # Handle alternative formats
-                parts = re.findall(r'\d+(?:\.\d+)?', member_str)
+                parts = _NUM_RE.findall(member_str)
                 if len(parts) >= 2:
                     section_type = member_type.upper()
                     return f"{parts[0]}{section_type}{parts[1]}"
@@ -120,7 +248,7 @@ class MemberParser:
         elif member_type in ['ub_alt', 'uc_alt', 'wb_alt']:
             # Convert UB310x46.2 to 310UB46.2
             section_type = member_type.replace('_alt', '').upper()
-            parts = re.findall(r'\d+(?:\.\d+)?', member_str)
+            parts = _NUM_RE.findall(member_str)
             if len(parts) >= 2:
                 return f"{parts[0]}{section_type}{parts[1]}"
         
@@ -132,13 +260,11 @@ class MemberParser:
             # Standardize angles: 75x75x6UA, 75EA6, 150x90UA10
             if member_type == 'angle_ea':
                 # Convert 75EA6 to 75x75x6EA
-                parts = re.findall(r'\d+(?:\.\d+)?', member_str)
+                parts = _NUM_RE.findall(member_str)
                 if len(parts) >= 2:
                     return f"{parts[0]}x{parts[0]}x{parts[1]}EA"
-            elif 'UA' in member_str:
-                return member_str.replace('UA', 'UA')
-            elif 'EA' in member_str:
-                return member_str.replace('EA', 'EA')
+            elif 'UA' in member_str or 'EA' in member_str:
+                return member_str
             elif 'L' in member_str:
                 return member_str.replace('L', 'UA')  # Convert L notation to UA
             else:
@@ -173,14 +299,15 @@ class MemberComparator:
         
         structural_set = {m['normalized'] for m in structural_members}
         shop_set = {m['normalized'] for m in shop_members}
+        matching = structural_set & shop_set
         
         results = {
-            'matching_members': list(structural_set & shop_set),
+            'matching_members': list(matching),
             'missing_in_shop': list(structural_set - shop_set),
             'extra_in_shop': list(shop_set - structural_set),
             'structural_count': len(structural_members),
             'shop_count': len(shop_members),
-            'match_percentage': len(structural_set & shop_set) / max(len(structural_set), 1) * 100
+            'match_percentage': len(matching) / max(len(structural_set), 1) * 100
         }
         
         return results
@@ -190,38 +317,37 @@ class MemberComparator:
                                comparison_results: Dict) -> pd.DataFrame:
         """Generate detailed comparison report"""
         
-        # Create comprehensive member list
-        all_members = set()
-        all_members.update(m['normalized'] for m in structural_members)
-        all_members.update(m['normalized'] for m in shop_members)
+        # One row per member on each side, joined on the normalized designation
+        structural_df = pd.DataFrame(structural_members, columns=['normalized', 'context']).rename(
+            columns={'normalized': 'Member', 'context': 'Structural Context'}
+        )
+        shop_df = pd.DataFrame(shop_members, columns=['normalized', 'context']).rename(
+            columns={'normalized': 'Member', 'context': 'Shop Context'}
+        )
+        report = structural_df.merge(shop_df, on='Member', how='outer', indicator=True)
+        report = report.sort_values('Member', ignore_index=True)
         
-        report_data = []
+        in_structural = report['_merge'] != 'right_only'
+        in_shop = report['_merge'] != 'left_only'
+        report['Status'] = np.select(
+            [in_structural & in_shop, in_structural],
+            ["✅ Match", "❌ Missing in Shop"],
+            default="⚠️ Extra in Shop"
+        )
+        report['In Structural'] = np.where(in_structural, "Yes", "No")
+        report['In Shop'] = np.where(in_shop, "Yes", "No")
         
-        for member in sorted(all_members):
-            # Find in structural
-            struct_info = next((m for m in structural_members if m['normalized'] == member), None)
-            shop_info = next((m for m in shop_members if m['normalized'] == member), None)
-            
-            status = "✅ Match"
-            if struct_info and not shop_info:
-                status = "❌ Missing in Shop"
-            elif shop_info and not struct_info:
-                status = "⚠️ Extra in Shop"
-            
-            report_data.append({
-                'Member': member,
-                'Status': status,
-                'In Structural': "Yes" if struct_info else "No",
-                'In Shop': "Yes" if shop_info else "No",
-                'Structural Context': struct_info['context'][:50] + "..." if struct_info and len(struct_info['context']) > 50 else (struct_info['context'] if struct_info else ""),
-                'Shop Context': shop_info['context'][:50] + "..." if shop_info and len(shop_info['context']) > 50 else (shop_info['context'] if shop_info else "")
-            })
+        for column in ['Structural Context', 'Shop Context']:
+            context = report[column].fillna("")
+            report[column] = context.str.slice(0, 50) + np.where(context.str.len() > 50, "...", "")
         
-        return pd.DataFrame(report_data)
+        return report[['Member', 'Status', 'In Structural', 'In Shop', 'Structural Context', 'Shop Context']]
 
 # Initialize processors
 @st.cache_resource
 def get_processors():
+    """Create the processors once per server process (shared across reruns and sessions),
+    so MemberParser compiles its combined member regex only once"""
     return PDFProcessor(), MemberParser(), MemberComparator()
 
 pdf_processor, member_parser, member_comparator = get_processors()
@@ -255,18 +381,20 @@ if st.button("🧪 Test Member Extraction (Single File)", type="secondary"):
         with st.spinner("Testing member extraction on structural drawings..."):
             all_structural_members = []
             
-            # Process each structural PDF
+            # Set page range if specified
+            page_range = None
+            if struct_end_page > 0:
+                page_range = (struct_start_page, struct_end_page)
+            
             for pdf_file in structural_pdfs:
                 st.write(f"📄 Processing: {pdf_file.name}")
+                result = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
+                if result['error']:
+                    st.error(f"Error processing PDF: {result['error']}")
+                else:
+                    st.info(f"Extraction method: {result['method']}")
                 
-                # Set page range if specified
-                page_range = None
-                if struct_end_page > 0:
-                    page_range = (struct_start_page, struct_end_page)
-                
-                structural_text = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
-                st.info(f"Extraction method: {pdf_processor.extraction_method}")
-                
+                structural_text = result['text']
                 if structural_text.strip():
                     st.success(f"✅ Successfully extracted text from {pdf_file.name}")
                     
@@ -275,7 +403,7 @@ if st.button("🧪 Test Member Extraction (Single File)", type="secondary"):
                         st.text(structural_text[:1000] + "..." if len(structural_text) > 1000 else structural_text)
                     
                     # Extract members
-                    structural_members = member_parser.extract_members_from_text(structural_text)
+                    structural_members = _dedup(member_parser.extract_members_from_text(structural_text))
                     all_structural_members.extend(structural_members)
                     st.success(f"Found {len(structural_members)} unique members in {pdf_file.name}")
                 else:
@@ -283,12 +411,7 @@ if st.button("🧪 Test Member Extraction (Single File)", type="secondary"):
             
             if all_structural_members:
                 # Remove duplicates across all files
-                unique_members = []
-                seen = set()
-                for member in all_structural_members:
-                    if member['normalized'] not in seen:
-                        unique_members.append(member)
-                        seen.add(member['normalized'])
+                unique_members = _dedup(all_structural_members)
                 
                 st.success(f"Found {len(unique_members)} total unique members across all structural drawings")
                 
@@ -322,63 +445,59 @@ if structural_pdfs and shop_pdfs:
             st.write("### Processing Structural Drawings...")
             all_structural_members = []
             
+            # Set page range if specified
+            page_range = None
+            if struct_end_page > 0:
+                page_range = (struct_start_page, struct_end_page)
+            
             for pdf_file in structural_pdfs:
                 st.write(f"📄 Processing: {pdf_file.name}")
+                result = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
+                if result['error']:
+                    st.error(f"Error processing PDF: {result['error']}")
+                else:
+                    st.info(f"Extraction method: {result['method']}")
                 
-                # Set page range if specified
-                page_range = None
-                if struct_end_page > 0:
-                    page_range = (struct_start_page, struct_end_page)
-                
-                structural_text = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
-                st.info(f"Extraction method: {pdf_processor.extraction_method}")
-                
+                structural_text = result['text']
                 if not structural_text.strip():
                     st.error(f"Failed to extract text from {pdf_file.name}")
                     continue
                 
-                structural_members = member_parser.extract_members_from_text(structural_text)
+                structural_members = _dedup(member_parser.extract_members_from_text(structural_text))
                 all_structural_members.extend(structural_members)
                 st.success(f"Found {len(structural_members)} unique members in {pdf_file.name}")
             
             # Remove duplicates across all structural files
-            unique_structural_members = []
-            seen_structural = set()
-            for member in all_structural_members:
-                if member['normalized'] not in seen_structural:
-                    unique_structural_members.append(member)
-                    seen_structural.add(member['normalized'])
+            unique_structural_members = _dedup(all_structural_members)
             
             # Process shop drawings
             st.write("### Processing Shop Drawings...")
             all_shop_members = []
             
+            # Set page range if specified
+            page_range = None
+            if shop_end_page > 0:
+                page_range = (shop_start_page, shop_end_page)
+            
             for pdf_file in shop_pdfs:
                 st.write(f"📄 Processing: {pdf_file.name}")
+                result = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
+                if result['error']:
+                    st.error(f"Error processing PDF: {result['error']}")
+                else:
+                    st.info(f"Extraction method: {result['method']}")
                 
-                # Set page range if specified
-                page_range = None
-                if shop_end_page > 0:
-                    page_range = (shop_start_page, shop_end_page)
-                
-                shop_text = pdf_processor.extract_text_from_pdf(pdf_file, page_range)
-                st.info(f"Extraction method: {pdf_processor.extraction_method}")
-                
+                shop_text = result['text']
                 if not shop_text.strip():
                     st.error(f"Failed to extract text from {pdf_file.name}")
                     continue
                 
-                shop_members = member_parser.extract_members_from_text(shop_text)
+                shop_members = _dedup(member_parser.extract_members_from_text(shop_text))
                 all_shop_members.extend(shop_members)
                 st.success(f"Found {len(shop_members)} unique members in {pdf_file.name}")
             
             # Remove duplicates across all shop files
-            unique_shop_members = []
-            seen_shop = set()
-            for member in all_shop_members:
-                if member['normalized'] not in seen_shop:
-                    unique_shop_members.append(member)
-                    seen_shop.add(member['normalized'])
+            unique_shop_members = _dedup(all_shop_members)
             
             # Compare members
             st.write("### Comparison Results")
@@ -489,6 +608,7 @@ st.sidebar.markdown("""
 ### Required Packages:
 ```
 streamlit==1.36.0
+pypdfium2==4.30.0
 pdfminer.six==20240706
 Pillow==10.4.0
 pandas==2.2.2
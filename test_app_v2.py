@@ -0,0 +1,35 @@
+import pytest
+
+from app_v2 import MemberParser, _dedup
+
+
+@pytest.fixture(scope="module")
+def member_parser():
+    return MemberParser()
+
+
+def _normalized(member_parser, text):
+    return [m['normalized'] for m in _dedup(member_parser.extract_members_from_text(text))]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("4M20 BOLTS", "M20"),
+    ("2xSHS100x6", "SHS100x6"),
+    ("2x310UB46.2", "310UB46.2"),
+    ("10x150PFC", "150PFC0"),
+    ("C1_200UC59.5", "200UC59.5"),
+    ("100x100x8EAx1200", "100x100x8EA"),
+    ("75x75x6UAx1200", "75x75x6UA"),
+    ("75x75x6UALG", "75x75x6UA"),
+    ("75x75x6Lx1200", "75x75x6UA"),
+])
+def test_prefixed_designations_are_found(member_parser, text, expected):
+    assert expected in _normalized(member_parser, text)
+
+
+@pytest.mark.parametrize("text, unexpected", [
+    ("ITEM24", "M24"),
+    ("310UB46.2", "10UB46.2"),
+])
+def test_mid_token_matches_are_rejected(member_parser, text, unexpected):
+    assert unexpected not in _normalized(member_parser, text)